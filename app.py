@@ -1,59 +1,208 @@
 # app.py - Daily rotation fantasy football blogs API
-import json
+import gzip
+import mmap
 import os
-from datetime import datetime, timezone
-from flask import Flask, jsonify
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+import orjson
+from flask import Flask, Response, g, has_request_context, jsonify, request
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from werkzeug.http import generate_etag
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
 
 # Load blogs data
 BLOGS_DATA = {}
-ALL_BLOGS = []
+ALL_BLOGS = ()
+
+# Daily rotation: 7 fixed windows of 5 blogs, built once at load time
+DAILY_SLICES = ((),) * 7
+DAILY_PLAYER_NAMES = ((),) * 7
+DAILY_PLAYER_MAPS = tuple({} for _ in range(7))
+
+# Lowercased player name -> blog, for case-insensitive lookups
+PLAYER_INDEX = {}
+
+# Per-blog stats columns, parallel to ALL_BLOGS
+WORD_COUNTS = ()
+POSITIONS_LIST = ()
+
+# Aggregate stats, built once at load time
+TOTAL_WORDS = 0
+DAILY_WORDS = (0,) * 7
+POSITIONS = {}
+
+# Working directory snapshot for the / debug info (pass ?live=1 to re-read it)
+STARTUP_CWD = os.getcwd()
+STARTUP_FILES = tuple(os.listdir('.'))
+
+# Rotation starts on Jan 1, 2025 (UTC)
+START_ORDINAL = date(2025, 1, 1).toordinal()
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Today's rotation state, kept current by _refresh_rotation
+CURRENT_ROTATION = None
+
+# Everything the handlers need to know about one day of the rotation
+RotationState = namedtuple(
+    'RotationState',
+    ['day_ordinal', 'idx', 'blogs', 'player_names', 'player_map', 'date_str', 'expires_at']
+)
+
+@lru_cache(maxsize=2)
+def _rotation(day_ordinal):
+    """Get the rotation state for a UTC day ordinal (cached per day)"""
+    idx = (day_ordinal - START_ORDINAL) % 7
+    return RotationState(
+        day_ordinal=day_ordinal,
+        idx=idx,
+        blogs=DAILY_SLICES[idx],
+        player_names=DAILY_PLAYER_NAMES[idx],
+        player_map=DAILY_PLAYER_MAPS[idx],
+        date_str=date.fromordinal(day_ordinal).isoformat(),
+        # Unix time of the midnight UTC that ends this day
+        expires_at=(day_ordinal + 1 - EPOCH_ORDINAL) * 86400
+    )
+
+def current_rotation():
+    """Get today's rotation state, remembering it for the response's cache headers"""
+    rotation = CURRENT_ROTATION
+    if has_request_context():
+        g.rotation = rotation
+    return rotation
 
 def get_daily_blogs():
     """Get the 5 blogs for today based on date rotation"""
-    if not ALL_BLOGS:
-        return []
-    
-    # Use current date to determine which blogs to show
-    today = datetime.now(timezone.utc)
-    
-    # Calculate days since Jan 1, 2025
-    start_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
-    days_since_start = (today - start_date).days
-    
-    # Cycle through weeks (7 days)
-    day_in_cycle = days_since_start % 7
-    
-    # Each day shows 5 blogs
-    start_index = day_in_cycle * 5
-    end_index = min(start_index + 5, len(ALL_BLOGS))
+    return current_rotation().blogs
+
+def _build_daily_blogs_json(daily_slices):
+    """Serialize each day's /api/blogs payload (everything but the date) once"""
+    return [
+        orjson.dumps({
+            'day_in_cycle': i + 1,
+            'count': len(window),
+            'blogs': window,
+            'next_rotation': 'Tomorrow at midnight UTC'
+        })
+        for i, window in enumerate(daily_slices)
+    ]
+
+DAILY_BLOGS_JSON = _build_daily_blogs_json(DAILY_SLICES)
+
+def _build_all_blogs_json(all_blogs):
+    """Serialize the /api/blogs/all payload once"""
+    return orjson.dumps({
+        'message': 'All blogs (admin view)',
+        'count': len(all_blogs),
+        'blogs': all_blogs
+    })
+
+def _gzip(body):
+    """Compress a pre-serialized body once, reproducibly (no timestamp in the header)"""
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+def _prebuilt_headers(body, cache_control=None):
+    """Build the (identity, gzip) header lists for a pre-serialized JSON body once"""
+    etag = generate_etag(body)
+    common = [('Vary', 'Accept-Encoding')]
+    if cache_control:
+        common.append(('Cache-Control', cache_control))
+    return (
+        common + [('ETag', f'"{etag}"')],
+        common + [('Content-Encoding', 'gzip'), ('ETag', f'"{etag}-gzip"')]
+    )
+
+# The full list only changes on redeploy, so it doesn't follow the daily max-age
+ALL_BLOGS_CACHE_CONTROL = 'public, max-age=3600'
+
+ALL_BLOGS_JSON = _build_all_blogs_json(ALL_BLOGS)
+ALL_BLOGS_GZ = _gzip(ALL_BLOGS_JSON)
+ALL_BLOGS_HEADERS = _prebuilt_headers(ALL_BLOGS_JSON, ALL_BLOGS_CACHE_CONTROL)
+
+@lru_cache(maxsize=2)
+def _daily_blogs_body(day_ordinal):
+    """Get the /api/blogs body, its gzipped copy and headers for a UTC day, with its date patched in"""
+    rotation = _rotation(day_ordinal)
+    body = DAILY_BLOGS_JSON[rotation.idx]
+    body = b'{"date":"' + rotation.date_str.encode('ascii') + b'",' + body[1:]
+    return body, _gzip(body), _prebuilt_headers(body)
+
+def _prebuilt_response(body, gz_body, headers):
+    """Serve a pre-serialized JSON body, using its gzipped copy if the client accepts gzip"""
+    if request.accept_encodings['gzip']:
+        return Response(gz_body, mimetype='application/json', headers=headers[1])
+    return Response(body, mimetype='application/json', headers=headers[0])
+
+def _refresh_rotation():
+    """Update today's rotation, then schedule the next update just after midnight UTC"""
+    global CURRENT_ROTATION
+    # One clock read picks both the day and the next run, so they can't straddle midnight;
+    # the 1s margin keeps a slightly early timer from re-selecting the old day
+    now = datetime.now(timezone.utc)
+    CURRENT_ROTATION = _rotation(now.toordinal())
+    next_run = (now + timedelta(days=1)).replace(hour=0, minute=0, second=1, microsecond=0)
+    timer = threading.Timer((next_run - now).total_seconds(), _refresh_rotation)
+    timer.daemon = True
+    timer.start()
+
+@app.after_request
+def add_cache_headers(response):
+    """Let clients and CDNs cache successful GETs until the next rotation"""
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200 or response.cache_control.no_store:
+        return response
     
-    return ALL_BLOGS[start_index:end_index]
+    if 'Cache-Control' not in response.headers:
+        # Expire with the day that was served, not the wall clock; if the refresh
+        # timer is running late the served day is already over, so revalidate
+        rotation = g.get('rotation', CURRENT_ROTATION)
+        max_age = int(rotation.expires_at - time.time())
+        response.headers['Cache-Control'] = f'public, max-age={max_age}' if max_age > 0 else 'no-cache'
+    if 'ETag' not in response.headers:
+        response.add_etag()
+    return response.make_conditional(request)
 
 @app.route('/')
 def home():
     """Home endpoint"""
-    daily_blogs = get_daily_blogs()
-    today = datetime.now(timezone.utc)
-    days_since_start = (today - datetime(2025, 1, 1, tzinfo=timezone.utc)).days
-    day_in_cycle = days_since_start % 7
+    rotation = current_rotation()
+    day_in_cycle = rotation.idx
+    daily_blogs = rotation.blogs
     
-    return jsonify({
+    live = request.args.get('live') == '1'
+    if live:
+        current_directory, files_in_directory = os.getcwd(), os.listdir('.')
+    else:
+        current_directory, files_in_directory = STARTUP_CWD, STARTUP_FILES
+    
+    response = jsonify({
         'message': 'Fantasy Football Blogs API - Daily Rotation',
         'total_blogs_in_system': len(ALL_BLOGS),
         'blogs_showing_today': len(daily_blogs),
         'rotation_info': {
             'current_day_in_cycle': day_in_cycle + 1,
-            'date': today.strftime('%Y-%m-%d'),
+            'date': rotation.date_str,
             'blogs_range': f"{day_in_cycle * 5 + 1}-{min((day_in_cycle + 1) * 5, len(ALL_BLOGS))}" if daily_blogs else "None"
         },
-        'todays_players': [blog['player_name'] for blog in daily_blogs],
+        'todays_players': rotation.player_names,
         'debug_info': {
-            'current_directory': os.getcwd(),
-            'files_in_directory': os.listdir('.'),
+            'current_directory': current_directory,
+            'files_in_directory': files_in_directory,
             'blogs_loaded': len(ALL_BLOGS) > 0,
             'total_blogs_loaded': len(ALL_BLOGS)
         },
@@ -64,51 +213,42 @@ def home():
             '/api/stats': 'GET - Statistics'
         }
     })
+    
+    # Live debug info must never be served from a cache
+    if live:
+        response.cache_control.no_store = True
+    return response
 
 @app.route('/api/blogs')
 def get_daily_blogs_api():
     """Get today's 5 blogs only"""
-    daily_blogs = get_daily_blogs()
-    today = datetime.now(timezone.utc)
-    days_since_start = (today - datetime(2025, 1, 1, tzinfo=timezone.utc)).days
-    day_in_cycle = days_since_start % 7
-    
-    return jsonify({
-        'date': today.strftime('%Y-%m-%d'),
-        'day_in_cycle': day_in_cycle + 1,
-        'count': len(daily_blogs),
-        'blogs': daily_blogs,
-        'next_rotation': 'Tomorrow at midnight UTC'
-    })
+    return _prebuilt_response(*_daily_blogs_body(current_rotation().day_ordinal))
 
 @app.route('/api/blogs/all')
 def get_all_blogs():
     """Get all blogs (admin endpoint)"""
-    return jsonify({
-        'message': 'All blogs (admin view)',
-        'count': len(ALL_BLOGS),
-        'blogs': ALL_BLOGS
-    })
+    return _prebuilt_response(ALL_BLOGS_JSON, ALL_BLOGS_GZ, ALL_BLOGS_HEADERS)
 
 @app.route('/api/blogs/<player_name>')
 def get_player_blog(player_name):
     """Get specific player blog (only if showing today)"""
-    daily_blogs = get_daily_blogs()
+    key = player_name.lower()
+    rotation = current_rotation()
     
     # Check if player is in today's rotation
-    for blog in daily_blogs:
-        if blog['player_name'].lower() == player_name.lower():
-            return jsonify(blog)
+    blog = rotation.player_map.get(key)
+    if blog is not None:
+        return jsonify(blog)
     
-    # Check if player exists in system but not showing today
-    if any(blog['player_name'].lower() == player_name.lower() for blog in ALL_BLOGS):
-        return jsonify({
-            'error': 'Player not showing today',
-            'message': f'{player_name} is not in today\'s rotation',
-            'todays_players': [blog['player_name'] for blog in daily_blogs]
-        }), 404
+    if key not in PLAYER_INDEX:
+        return jsonify({'error': 'Player not found'}), 404
     
-    return jsonify({'error': 'Player not found'}), 404
+    # Player exists in system but not showing today
+    return jsonify({
+        'error': 'Player not showing today',
+        'message': f'{player_name} is not in today\'s rotation',
+        'todays_players': rotation.player_names
+    }), 404
 
 @app.route('/api/stats')
 def get_stats():
@@ -116,53 +256,111 @@ def get_stats():
     if not ALL_BLOGS:
         return jsonify({'total_blogs': 0, 'message': 'No blogs loaded'})
     
-    daily_blogs = get_daily_blogs()
-    total_words = sum(blog.get('word_count', 0) for blog in ALL_BLOGS)
-    daily_words = sum(blog.get('word_count', 0) for blog in daily_blogs)
-    
-    positions = {}
-    for blog in ALL_BLOGS:
-        pos = blog.get('position', 'Unknown')
-        positions[pos] = positions.get(pos, 0) + 1
+    rotation = current_rotation()
     
     return jsonify({
         'total_blogs_in_system': len(ALL_BLOGS),
-        'blogs_showing_today': len(daily_blogs),
-        'total_words_all_blogs': total_words,
-        'words_in_todays_blogs': daily_words,
-        'positions': positions,
+        'blogs_showing_today': len(rotation.blogs),
+        'total_words_all_blogs': TOTAL_WORDS,
+        'words_in_todays_blogs': DAILY_WORDS[rotation.idx],
+        'positions': POSITIONS,
         'rotation_schedule': 'New 5 blogs every 24 hours'
     })
 
 def load_blogs_from_json():
     """Load blogs from the exported JSON file"""
-    global ALL_BLOGS, BLOGS_DATA
+    global ALL_BLOGS, BLOGS_DATA, PLAYER_INDEX, DAILY_SLICES, DAILY_PLAYER_NAMES, DAILY_PLAYER_MAPS
+    global DAILY_BLOGS_JSON, ALL_BLOGS_JSON, ALL_BLOGS_GZ, ALL_BLOGS_HEADERS
+    global WORD_COUNTS, POSITIONS_LIST, TOTAL_WORDS, DAILY_WORDS, POSITIONS, CURRENT_ROTATION
     
     json_file = 'fantasy_blogs_export_20250731_001535.json'
     
     if os.path.exists(json_file):
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Parse straight from a read-only mapping of the file
+            with open(json_file, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m, memoryview(m) as view:
+                    data = orjson.loads(view)
             
             print(f"🔍 JSON structure: {list(data.keys()) if isinstance(data, dict) else 'List'}")
             
             # Handle the actual structure: {"blogs": [...], "count": 35}
             if isinstance(data, dict) and 'blogs' in data:
-                ALL_BLOGS = data['blogs']
+                blogs = data['blogs']
             elif isinstance(data, list):
-                ALL_BLOGS = data
+                blogs = data
             else:
                 print(f"❌ Unexpected JSON structure")
                 print(f"Data type: {type(data)}")
                 print(f"Data keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
                 return False
             
+            # Everything below is built into locals and only published once it all
+            # succeeds, so a bad record can't leave the endpoints half-loaded
+            
+            # Freeze the blog list and intern the name/position strings shared by every index
+            for blog in blogs:
+                for field in ('player_name', 'position'):
+                    if isinstance(blog.get(field), str):
+                        blog[field] = sys.intern(blog[field])
+            blogs = tuple(blogs)
+            
             # Populate the BLOGS_DATA dict for compatibility
-            for blog in ALL_BLOGS:
+            blogs_data = {}
+            for blog in blogs:
                 player_name = blog.get('player_name')
                 if player_name:
-                    BLOGS_DATA[player_name] = blog
+                    blogs_data[player_name] = blog
+            
+            # Lowercase each player name once; requests only lower the queried name.
+            # Blogs without a name still rotate, they just can't be looked up by name.
+            lower_names = tuple(
+                sys.intern(blog['player_name'].lower()) if isinstance(blog.get('player_name'), str) else None
+                for blog in blogs
+            )
+            player_index = {}
+            for key, blog in zip(lower_names, blogs):
+                if key is not None:
+                    player_index.setdefault(key, blog)
+            
+            # Precompute the 7 daily windows of 5 blogs each
+            daily_slices = tuple(blogs[i * 5:i * 5 + 5] for i in range(7))
+            daily_player_names = tuple(
+                tuple(blog['player_name'] for blog in window if isinstance(blog.get('player_name'), str))
+                for window in daily_slices
+            )
+            daily_player_maps = tuple(
+                {key: blog for key, blog in zip(lower_names[i * 5:i * 5 + 5], daily_slices[i]) if key is not None}
+                for i in range(7)
+            )
+            daily_blogs_json = _build_daily_blogs_json(daily_slices)
+            
+            # Precompute stats (null word counts/positions count as 0/'Unknown')
+            word_counts = tuple(blog.get('word_count') or 0 for blog in blogs)
+            positions_list = tuple(blog.get('position') or 'Unknown' for blog in blogs)
+            total_words = sum(word_counts)
+            daily_words = tuple(sum(word_counts[i * 5:i * 5 + 5]) for i in range(7))
+            positions = dict(Counter(positions_list))
+            
+            # Precompute the /api/blogs/all body
+            all_blogs_json = _build_all_blogs_json(blogs)
+            all_blogs_gz = _gzip(all_blogs_json)
+            all_blogs_headers = _prebuilt_headers(all_blogs_json, ALL_BLOGS_CACHE_CONTROL)
+            
+            # Publish everything together
+            ALL_BLOGS, BLOGS_DATA, PLAYER_INDEX = blogs, blogs_data, player_index
+            DAILY_SLICES, DAILY_PLAYER_NAMES, DAILY_PLAYER_MAPS = daily_slices, daily_player_names, daily_player_maps
+            DAILY_BLOGS_JSON = daily_blogs_json
+            WORD_COUNTS, POSITIONS_LIST = word_counts, positions_list
+            TOTAL_WORDS, DAILY_WORDS, POSITIONS = total_words, daily_words, positions
+            ALL_BLOGS_JSON, ALL_BLOGS_GZ, ALL_BLOGS_HEADERS = all_blogs_json, all_blogs_gz, all_blogs_headers
+            _rotation.cache_clear()
+            _daily_blogs_body.cache_clear()
+            
+            # On a reload, re-point the live rotation at the new data (the first load
+            # runs before _refresh_rotation has set it)
+            if CURRENT_ROTATION is not None:
+                CURRENT_ROTATION = _rotation(CURRENT_ROTATION.day_ordinal)
             
             print(f"✅ Loaded {len(ALL_BLOGS)} blogs from {json_file}")
             print(f"📅 Daily rotation: 5 blogs per day for 7 days")
@@ -184,8 +382,14 @@ def load_blogs_from_json():
         print(f"Available files: {os.listdir('.')}")
         return False
 
-# Load blogs when the module is imported
+# Load blogs when the module is imported, then keep the rotation current
 load_blogs_from_json()
+_refresh_rotation()
+
+# Timer threads don't survive fork, so forked workers (gunicorn preload_app) start their own
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_refresh_rotation)
 
+# Local development only; production runs under gunicorn (see gunicorn.conf.py)
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
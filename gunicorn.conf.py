@@ -0,0 +1,18 @@
+# gunicorn.conf.py - Production server settings, picked up automatically by `gunicorn app:app`
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Blogs are loaded at import and read-only afterwards, so workers share nothing.
+# Size the pool from the CPUs this process may run on (container affinity), not the
+# host's, capped small since CPU quotas aren't visible here; WEB_CONCURRENCY overrides.
+try:
+    _cpus = len(os.sched_getaffinity(0))
+except AttributeError:
+    _cpus = os.cpu_count() or 1
+workers = int(os.environ.get('WEB_CONCURRENCY', min(_cpus, 4)))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Load the app (and the blogs JSON) once in the master before forking
+preload_app = True